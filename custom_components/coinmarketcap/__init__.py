@@ -1,16 +1,20 @@
 """The CoinMarketCap integration."""
 import asyncio
 import logging
-from datetime import timedelta
+import math
+from datetime import datetime, timedelta
 from typing import Any
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import issue_registry as ir
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN, 
@@ -20,6 +24,11 @@ from .const import (
     CONF_DECIMALS, 
     CONF_SHOW_SENSORS,
     CONF_CURRENCY,
+    CONF_ALIGN_TO_UPSTREAM,
+    CONF_PAIRS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
     API_URL, 
     GLOBAL_API_URL,
     FEAR_GREED_API_URL,
@@ -28,34 +37,69 @@ from .const import (
     DEFAULT_DECIMALS,
     DEFAULT_CURRENCY,
     DEFAULT_SENSORS,
+    DEFAULT_ALIGN_TO_UPSTREAM,
+    DEFAULT_PAIRS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    EVENT_UPDATE,
+    QUOTE_CACHE_TTL,
+    QUARANTINE_RECHECK_INTERVAL,
     SENSOR_TYPES
 )
+from .events import build_snapshot, diff_snapshots
+from .key_pool import ApiKeyPool, ApiKeyState, normalize_api_keys
+from .pairs import PairRatioMatrix, parse_pairs
+from .quotes import QuoteBatcher
+from .scheduler import AdaptiveInterval, UpstreamCadence, upstream_timestamp
+from .services import async_setup_services
+from .symbols import InvalidSymbolsError, async_fetch_isolating
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the CoinMarketCap services."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CoinMarketCap from a config entry."""
     session = async_get_clientsession(hass)
     
     # Use options if available, otherwise fallback to data
-    api_key = entry.options.get(CONF_API_KEY, entry.data[CONF_API_KEY])
+    api_keys = normalize_api_keys(entry.options.get(CONF_API_KEY, entry.data[CONF_API_KEY]))
     symbols = entry.options.get(CONF_SYMBOLS, entry.data[CONF_SYMBOLS])
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
     decimals = entry.options.get(CONF_DECIMALS, entry.data.get(CONF_DECIMALS, DEFAULT_DECIMALS))
     currency = entry.options.get(CONF_CURRENCY, entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))
     show_sensors = entry.options.get(CONF_SHOW_SENSORS, entry.data.get(CONF_SHOW_SENSORS, DEFAULT_SENSORS))
+    align_to_upstream = entry.options.get(CONF_ALIGN_TO_UPSTREAM, entry.data.get(CONF_ALIGN_TO_UPSTREAM, DEFAULT_ALIGN_TO_UPSTREAM))
+    pairs = entry.options.get(CONF_PAIRS, entry.data.get(CONF_PAIRS, DEFAULT_PAIRS))
+    adaptive_polling = entry.options.get(CONF_ADAPTIVE_POLLING, entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING))
+    min_scan_interval = entry.options.get(CONF_MIN_SCAN_INTERVAL, entry.data.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+    # Without a configured maximum, never start adaptive polling faster than the regular interval
+    max_scan_interval = entry.options.get(CONF_MAX_SCAN_INTERVAL, entry.data.get(CONF_MAX_SCAN_INTERVAL, max(DEFAULT_MAX_SCAN_INTERVAL, scan_interval)))
 
     coordinator = CoinMarketCapDataUpdateCoordinator(
         hass,
         session,
-        api_key=api_key,
+        api_keys=api_keys,
         symbols=symbols,
         scan_interval=scan_interval,
         decimals=decimals,
         currency=currency,
         show_sensors=show_sensors,
+        align_to_upstream=align_to_upstream,
+        pairs=pairs,
+        adaptive_interval=(
+            AdaptiveInterval(scan_interval, min_scan_interval, max_scan_interval)
+            if adaptive_polling else None
+        ),
     )
 
     await coordinator.async_config_entry_first_refresh()
@@ -75,6 +119,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        ir.async_delete_issue(hass, DOMAIN, f"invalid_symbols_{entry.entry_id}")
 
     return unload_ok
 
@@ -89,20 +134,46 @@ class CoinMarketCapDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self, 
         hass: HomeAssistant, 
         session: aiohttp.ClientSession, 
-        api_key: str, 
+        api_keys: list[str], 
         symbols: str, 
         scan_interval: int, 
         decimals: int, 
         currency: str, 
-        show_sensors: list[str]
+        show_sensors: list[str],
+        align_to_upstream: bool = DEFAULT_ALIGN_TO_UPSTREAM,
+        pairs: str = DEFAULT_PAIRS,
+        adaptive_interval: AdaptiveInterval | None = None
     ) -> None:
         """Initialize the coordinator."""
         self.session = session
-        self.api_key = api_key
+        self.key_pool = ApiKeyPool(api_keys)
         self.symbols = symbols.replace(" ", "")
         self.decimals = decimals
         self.currency = currency
         self.show_sensors = show_sensors
+        self.scan_interval = scan_interval
+        self.align_to_upstream = align_to_upstream
+        self.adaptive_interval = adaptive_interval
+        self.cadence = {
+            category: UpstreamCadence(category)
+            for category in ("symbol", "global", "fear_greed")
+        }
+        self.pairs = PairRatioMatrix(parse_pairs(pairs))
+        tracked = set(self.symbols.upper().split(","))
+        for base, quote in self.pairs.pairs:
+            missing = {base, quote} - tracked
+            if missing:
+                _LOGGER.warning(
+                    "Pair %s/%s uses symbols that are not tracked: %s",
+                    base, quote, ", ".join(sorted(missing))
+                )
+        self._quote_cache: dict[str, tuple[datetime, dict[str, Any]]] = {}
+        self._quote_batcher = QuoteBatcher(hass, self._async_fetch_quotes)
+        self._snapshot: dict[str, dict[str, dict[str, Any]]] = {}
+        # When the coordinator is expected to poll next, for diagnostics
+        self.next_poll: datetime | None = None
+        # Symbols rejected by CoinMarketCap, mapped to when they are retried
+        self.quarantine: dict[str, datetime] = {}
         
         super().__init__(
             hass,
@@ -119,75 +190,322 @@ class CoinMarketCapDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 categories.add(SENSOR_TYPES[sensor_type]["category"])
         return categories
 
-    async def _async_update_data(self):
-        """Fetch data from API."""
-        headers = {
-            'X-CMC_PRO_API_KEY': self.api_key,
-            'Accepts': 'application/json',
+    def _get_due_categories(self, wanted: set[str]) -> set[str]:
+        """Return the wanted categories whose upstream data may have advanced."""
+        if not (self.align_to_upstream or self.adaptive_interval) or self.data is None:
+            return set(wanted)
+        now = dt_util.utcnow()
+        # key/info carries no upstream timestamp and costs no credits: refresh it on every tick
+        return {
+            category for category in wanted
+            if category not in self.cadence or self.cadence[category].is_due(now)
         }
-        
-        # Determine which calls are needed
-        enabled_categories = self._get_enabled_categories()
-        
-        # 1. Fetch cryptocurrency quotes (symbol category)
-        params_quotes = {
-            'symbol': self.symbols,
-            'convert': self.currency
-        }
-        
-        async def fetch_url(url: str, params: dict[str, Any] | None = None) -> dict[str, Any] | None:
-            """Helper to fetch JSON with error handling."""
+
+    def _schedule_next_poll(
+        self, final_data: dict[str, Any], wanted: set[str], due: set[str], quotes_fetched: bool
+    ) -> None:
+        """Learn upstream cadences and phase-align the next coordinator tick.
+
+        Symbol quotes use the volatility-adaptive interval when enabled; the
+        other endpoints keep the configured interval. Alignment never holds
+        quotes back past the adaptive maximum, and is skipped while volatile.
+        """
+        now = dt_util.utcnow()
+        if not (self.align_to_upstream or self.adaptive_interval):
+            self.next_poll = now + self.update_interval
+            return
+
+        interval = timedelta(seconds=self.scan_interval)
+        intervals = {category: interval for category in self.cadence}
+        if self.adaptive_interval:
+            if quotes_fetched:
+                self.adaptive_interval.update(final_data.get('symbols'), self.currency)
+                _LOGGER.debug(
+                    "Adaptive quote interval %ss (%s)",
+                    self.adaptive_interval.interval, self.adaptive_interval.reason,
+                )
+            intervals["symbol"] = timedelta(seconds=self.adaptive_interval.interval)
+
+        for category in due & set(self.cadence):
+            tracker = self.cadence[category]
+            data_key = "symbols" if category == "symbol" else category
+            tracker.observe(upstream_timestamp(category, final_data.get(data_key)), now)
+            adaptive = self.adaptive_interval if category == "symbol" else None
+            tracker.schedule(
+                now,
+                intervals[category],
+                align=self.align_to_upstream and not (adaptive and adaptive.volatile),
+            )
+            if adaptive:
+                tracker.next_due = min(
+                    tracker.next_due, now + timedelta(seconds=adaptive.maximum)
+                )
+
+        next_due = min(
+            (
+                self.cadence[category].next_due
+                for category in wanted & set(self.cadence)
+                if self.cadence[category].next_due
+            ),
+            default=now + interval,
+        )
+        self.update_interval = max(next_due - now, MIN_UPDATE_INTERVAL)
+        self.next_poll = now + self.update_interval
+        _LOGGER.debug("Next CoinMarketCap poll in %s", self.update_interval)
+
+    async def _fetch_url(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        credits: int = 1,
+        api_key: ApiKeyState | None = None,
+    ) -> dict[str, Any] | None:
+        """Helper to fetch JSON with error handling.
+
+        Requests are sent with the pool key that has the most headroom. Keys that
+        are rejected or rate limited are taken out of rotation and the request is
+        retried with the next one; re-auth is only triggered once no key is left.
+        Passing `api_key` pins the request to that key.
+        """
+        tried: set[int] = set()
+        while True:
+            now = dt_util.utcnow()
+            key = api_key or self.key_pool.select(now, exclude=tried)
+            if key is None:
+                if self.key_pool.all_invalid:
+                    raise ConfigEntryAuthFailed("Invalid API Key or insufficient permissions")
+                _LOGGER.warning("No API key with remaining credits available for %s", url)
+                return None
+            tried.add(key.index)
+            key.record_use(now, credits)
+
+            headers = {
+                'X-CMC_PRO_API_KEY': key.key,
+                'Accepts': 'application/json',
+            }
             try:
                 async with self.session.get(url, headers=headers, params=params, timeout=10) as response:
-                    if response.status in (401, 403):
-                        _LOGGER.error("Authentication failed (401/403) for %s. Triggering re-auth.", url)
-                        raise ConfigEntryAuthFailed("Invalid API Key or insufficient permissions")
+                    if response.status in (401, 402, 403):
+                        # 402: the key's plan payment is required or expired
+                        _LOGGER.error(
+                            "Authentication failed (%s) for %s with API key #%s",
+                            response.status, url, key.index + 1,
+                        )
+                        self.key_pool.mark_invalid(key)
+                        if self.key_pool.all_invalid:
+                            raise ConfigEntryAuthFailed("Invalid API Key or insufficient permissions")
+                        if api_key:
+                            return None
+                        continue
                     
                     if response.status == 429:
                         _LOGGER.warning("API Rate limit reached for %s", url)
-                        return None
+                        error_code = (await self._read_error_status(response, url)).get('error_code')
+                        try:
+                            error_code = int(error_code)
+                        except (TypeError, ValueError):
+                            error_code = None
+                        self.key_pool.mark_rate_limited(key, now, error_code)
+                        if api_key:
+                            return None
+                        continue
                         
+                    if response.status == 400:
+                        message = (await self._read_error_status(response, url)).get('error_message') or ""
+                        if "symbol" in message.lower():
+                            raise InvalidSymbolsError(message)
+
                     if response.status != 200:
                         _LOGGER.error("Error fetching %s: %s", url, response.status)
                         return None
                     return await response.json()
-            except ConfigEntryAuthFailed:
+            except (ConfigEntryAuthFailed, InvalidSymbolsError):
                 raise
             except Exception as err:
                 _LOGGER.error("Exception fetching %s: %s", url, err)
                 return None
 
-        tasks = []
+    async def _read_error_status(self, response: aiohttp.ClientResponse, url: str) -> dict[str, Any]:
+        """Return the `status` object of a CMC error response, if it can be read."""
+        try:
+            payload = await response.json()
+        except (aiohttp.ContentTypeError, ValueError) as err:
+            _LOGGER.debug("Could not read error body from %s: %s", url, err)
+            return {}
+        if not isinstance(payload, dict) or not isinstance(payload.get('status'), dict):
+            return {}
+        return payload['status']
+
+    async def _async_refresh_key_info(self, force: bool) -> dict[str, Any] | None:
+        """Refresh key/info of the pool keys and return their combined usage."""
+        now = dt_util.utcnow()
+        keys = [
+            key for key in self.key_pool.keys
+            if not key.invalid and (force or key.info_stale(now))
+        ]
+        results = await asyncio.gather(
+            *(self._fetch_url(KEY_INFO_API_URL, credits=0, api_key=key) for key in keys),
+            return_exceptions=True,
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, ConfigEntryAuthFailed):
+                raise result
+            if isinstance(result, dict) and 'data' in result:
+                self.key_pool.update_info(key, result['data'], now)
+        return self.key_pool.aggregate_info()
+
+    def _cache_quotes(self, quotes: dict[str, Any]) -> None:
+        """Remember fetched quotes for on-demand lookups."""
+        now = dt_util.utcnow()
+        for symbol, coin in quotes.items():
+            self._quote_cache[symbol.upper()] = (now, coin)
+        for symbol in [s for s, (fetched, _) in self._quote_cache.items() if now - fetched > QUOTE_CACHE_TTL]:
+            self._quote_cache.pop(symbol)
+
+    async def _async_fetch_quote_batch(self, symbols: list[str]) -> dict[str, Any] | None:
+        """Fetch quotes for a list of symbols with a single request."""
+        result = await self._fetch_url(
+            API_URL,
+            {'symbol': ",".join(symbols), 'convert': self.currency},
+            credits=math.ceil(len(symbols) / 100),
+        )
+        if not result or 'data' not in result:
+            return None
+        return result['data']
+
+    async def _async_fetch_quotes(self, symbols: set[str]) -> dict[str, Any]:
+        """Fetch quotes for arbitrary symbols, skipping the ones CMC does not know."""
+        data, invalid = await async_fetch_isolating(self._async_fetch_quote_batch, sorted(symbols))
+        if data is None:
+            raise HomeAssistantError(f"Failed to fetch quotes for {', '.join(sorted(symbols))}")
+        if invalid:
+            _LOGGER.debug("Unknown symbols requested: %s", ", ".join(sorted(invalid)))
+        self._cache_quotes(data)
+        return data
+
+    async def _async_fetch_symbol_quotes(self) -> dict[str, Any] | None:
+        """Fetch the tracked symbols, quarantining the ones CMC rejects.
+
+        Quarantined symbols are left out of the request until their recheck
+        time, so a single delisted or mistyped ticker does not blank the rest.
+        """
+        now = dt_util.utcnow()
+        symbols = [
+            symbol for symbol in dict.fromkeys(self.symbols.upper().split(","))
+            if symbol and now >= self.quarantine.get(symbol, now)
+        ]
+        if not symbols:
+            return None
+
+        data, invalid = await async_fetch_isolating(self._async_fetch_quote_batch, symbols)
+        for symbol in invalid:
+            if symbol not in self.quarantine:
+                _LOGGER.warning("CoinMarketCap does not know symbol %s; skipping it", symbol)
+            self.quarantine[symbol] = now + QUARANTINE_RECHECK_INTERVAL
+        for symbol in [s for s in self.quarantine if data and s in data]:
+            _LOGGER.info("Symbol %s is accepted by CoinMarketCap again", symbol)
+            self.quarantine.pop(symbol)
+        self._update_invalid_symbols_issue()
+
+        if data is None:
+            return None
+        return {'data': data}
+
+    def _update_invalid_symbols_issue(self) -> None:
+        """Create or clear the repair issue listing quarantined symbols."""
+        if self.config_entry is None:
+            return
+        issue_id = f"invalid_symbols_{self.config_entry.entry_id}"
+        if not self.quarantine:
+            ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+            return
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="invalid_symbols",
+            translation_placeholders={"symbols": ", ".join(sorted(self.quarantine))},
+        )
+
+    async def async_get_quotes(self, symbols: list[str], max_age: timedelta) -> dict[str, Any]:
+        """Return quotes for the symbols, serving cached data younger than max_age."""
+        now = dt_util.utcnow()
+        quotes = {}
+        stale = set()
+        for symbol in symbols:
+            cached = self._quote_cache.get(symbol)
+            if cached and now - cached[0] <= max_age:
+                quotes[symbol] = cached[1]
+            else:
+                stale.add(symbol)
+
+        if stale:
+            quotes.update(await self._quote_batcher.async_get(stale))
+        return quotes
+
+    async def _async_update_data(self):
+        """Fetch data from API."""
         
+        # Determine which calls are needed
+        enabled_categories = self._get_enabled_categories()
+        wanted = set(enabled_categories)
         # Always fetch quotes if symbol-based sensors are enabled (or if no sensors enabled yet)
-        if "symbol" in enabled_categories or not enabled_categories:
-            tasks.append(fetch_url(API_URL, params_quotes))
+        if not enabled_categories:
+            wanted.add("symbol")
+        # Pair sensors are derived from the symbol quotes
+        if self.pairs.pairs:
+            wanted.add("symbol")
+        # Skip endpoints whose upstream data is not expected to have advanced yet
+        due = self._get_due_categories(wanted)
+        
+        tasks = []
+        
+        # 1. Fetch cryptocurrency quotes (symbol category)
+        if "symbol" in due:
+            tasks.append(self._async_fetch_symbol_quotes())
         else:
             tasks.append(asyncio.sleep(0, result=None)) # Placeholder
             
-        if "global" in enabled_categories:
-            tasks.append(fetch_url(GLOBAL_API_URL, params={'convert': self.currency}))
+        if "global" in due:
+            tasks.append(self._fetch_url(GLOBAL_API_URL, params={'convert': self.currency}))
         else:
             tasks.append(asyncio.sleep(0, result=None))
             
-        if "fear_greed" in enabled_categories:
-            tasks.append(fetch_url(FEAR_GREED_API_URL))
+        if "fear_greed" in due:
+            tasks.append(self._fetch_url(FEAR_GREED_API_URL))
         else:
             tasks.append(asyncio.sleep(0, result=None))
             
-        if "key_info" in enabled_categories:
-            tasks.append(fetch_url(KEY_INFO_API_URL))
+        # key/info also feeds the key rotation, so refresh it periodically for pools
+        if "key_info" in due or len(self.key_pool) > 1:
+            tasks.append(self._async_refresh_key_info(force="key_info" in due))
         else:
             tasks.append(asyncio.sleep(0, result=None))
 
         # Execute all needed fetches in parallel
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, ConfigEntryAuthFailed):
+                raise result
+            if isinstance(result, Exception):
+                _LOGGER.error("Unexpected error fetching CoinMarketCap data: %s", result)
+        results = [None if isinstance(result, Exception) else result for result in results]
 
         final_data = {}
+
+        # Carry over data of endpoints skipped at this tick
+        if self.data:
+            for category in wanted - due:
+                data_key = "symbols" if category == "symbol" else category
+                if data_key in self.data:
+                    final_data[data_key] = self.data[data_key]
         
         # Process Quotes
         if results[0] and 'data' in results[0]:
             final_data['symbols'] = results[0]['data']
+            self._cache_quotes(results[0]['data'])
         
         # Process Global Metrics
         if results[1] and 'data' in results[1]:
@@ -203,10 +521,41 @@ class CoinMarketCapDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 final_data['fear_greed'] = fg_list
 
         # Process Key Info (API Credits)
-        if len(results) > 3 and results[3] and 'data' in results[3]:
-            final_data['key_info'] = results[3]['data']
+        if len(results) > 3 and results[3] and "key_info" in wanted:
+            final_data['key_info'] = results[3]
+
+        # Process Pair Ratios (computed locally from the quotes)
+        if self.pairs.pairs and 'symbols' in final_data:
+            final_data['pairs'] = self.pairs.update(final_data['symbols'], self.currency)
+
+        self._schedule_next_poll(final_data, wanted, due, quotes_fetched=bool(results[0]))
 
         if not final_data:
             raise UpdateFailed("Failed to fetch any data from CoinMarketCap")
+
+        self._fire_update_event(final_data)
             
         return final_data
+
+    def _fire_update_event(self, final_data: dict[str, Any]) -> None:
+        """Fire one event with the metrics that changed since the previous refresh.
+
+        The first event after setup carries every value and is flagged as initial.
+        """
+        initial = not self._snapshot
+        snapshot = build_snapshot(final_data, self.currency, self.show_sensors)
+        changes = diff_snapshots(self._snapshot, snapshot)
+        # Keep the last known values of anything missing from this refresh (e.g. a failed call)
+        for group, entries in snapshot.items():
+            self._snapshot[group] = {**self._snapshot.get(group, {}), **entries}
+        if not changes:
+            return
+        self.hass.bus.async_fire(
+            EVENT_UPDATE,
+            {
+                "entry_id": self.config_entry.entry_id if self.config_entry else None,
+                "currency": self.currency,
+                "initial": initial,
+                "changes": changes,
+            },
+        )
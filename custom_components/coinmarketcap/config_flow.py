@@ -9,6 +9,7 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from .const import (
     DOMAIN, 
     CONF_API_KEY, 
@@ -17,19 +18,32 @@ from .const import (
     CONF_DECIMALS, 
     CONF_SHOW_SENSORS,
     CONF_CURRENCY,
-    API_URL, 
+    CONF_ALIGN_TO_UPSTREAM,
+    CONF_PAIRS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    KEY_INFO_API_URL,
     DEFAULT_SCAN_INTERVAL, 
     DEFAULT_DECIMALS,
     DEFAULT_CURRENCY,
     DEFAULT_SENSORS,
+    DEFAULT_ALIGN_TO_UPSTREAM,
+    DEFAULT_PAIRS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
     SENSOR_TYPES,
     CURRENCIES
 )
+from .key_pool import normalize_api_keys
 
 _LOGGER = logging.getLogger(__name__)
 
+API_KEYS_SELECTOR = TextSelector(TextSelectorConfig(multiple=True))
+
 DATA_SCHEMA = vol.Schema({
-    vol.Required(CONF_API_KEY): str,
+    vol.Required(CONF_API_KEY): API_KEYS_SELECTOR,
     vol.Required(CONF_SYMBOLS, default="BTC,ETH,SOL"): str,
     vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(cv.positive_int, vol.Range(min=60)),
     vol.Optional(CONF_DECIMALS, default=DEFAULT_DECIMALS): vol.All(cv.positive_int, vol.Range(min=0)),
@@ -37,8 +51,52 @@ DATA_SCHEMA = vol.Schema({
     vol.Optional(CONF_SHOW_SENSORS, default=DEFAULT_SENSORS): cv.multi_select(
         {k: v["name"] for k, v in SENSOR_TYPES.items()}
     ),
+    vol.Optional(CONF_ALIGN_TO_UPSTREAM, default=DEFAULT_ALIGN_TO_UPSTREAM): bool,
+    vol.Optional(CONF_PAIRS, default=DEFAULT_PAIRS): str,
+    vol.Optional(CONF_ADAPTIVE_POLLING, default=DEFAULT_ADAPTIVE_POLLING): bool,
+    vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): vol.All(cv.positive_int, vol.Range(min=60)),
+    vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): vol.All(cv.positive_int, vol.Range(min=60)),
 })
 
+async def _test_api_key(api_key: str) -> str | None:
+    """Test the API key against key/info, which costs no credits.
+
+    Returns an error key, or None if the key was not rejected. Rate limits and
+    other errors do not make a key invalid.
+    """
+    headers = {
+        'X-CMC_PRO_API_KEY': api_key,
+        'Accepts': 'application/json',
+    }
+    async with aiohttp.ClientSession() as session:
+        try:
+            async with session.get(KEY_INFO_API_URL, headers=headers) as response:
+                if response.status in (401, 402, 403):
+                    return "invalid_auth"
+                return None
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Could not validate API key: %s", err)
+            return "cannot_connect"
+
+async def _test_api_keys(api_keys: list[str]) -> str | None:
+    """Test that there is at least one API key and none is rejected."""
+    if not api_keys:
+        return "invalid_auth"
+    for api_key in api_keys:
+        if error := await _test_api_key(api_key):
+            return error
+    return None
+
+def _valid_interval_bounds(user_input: dict[str, Any]) -> bool:
+    """Check that adaptive polling bounds enclose the update interval."""
+    if not user_input.get(CONF_ADAPTIVE_POLLING):
+        return True
+    return (
+        user_input.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        <= user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        <= user_input.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+    )
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CoinMarketCap."""
 
@@ -48,12 +106,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors: dict[str, str] = {}
         if user_input is not None:
-            # Validate the API key
-            valid = await self._test_api_key(user_input[CONF_API_KEY])
-            if valid:
-                return self.async_create_entry(title="CoinMarketCap", data=user_input)
+            # Validate the interval bounds and the API keys
+            user_input[CONF_API_KEY] = normalize_api_keys(user_input[CONF_API_KEY])
+            if not _valid_interval_bounds(user_input):
+                errors["base"] = "invalid_interval_bounds"
+            elif error := await _test_api_keys(user_input[CONF_API_KEY]):
+                errors["base"] = error
             else:
-                errors["base"] = "invalid_auth"
+                return self.async_create_entry(title="CoinMarketCap", data=user_input)
 
         return self.async_show_form(
             step_id="user", data_schema=DATA_SCHEMA, errors=errors
@@ -70,18 +130,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle re-authentication confirm step."""
         errors = {}
         if user_input is not None:
-            valid = await self._test_api_key(user_input[CONF_API_KEY])
-            if valid:
+            user_input[CONF_API_KEY] = normalize_api_keys(user_input[CONF_API_KEY])
+            error = await _test_api_keys(user_input[CONF_API_KEY])
+            if not error:
+                # Keys in the options take precedence, so replace them there as well
+                options = self._reauth_entry.options
+                if CONF_API_KEY in options:
+                    options = {**options, **user_input}
                 self.hass.config_entries.async_update_entry(
-                    self._reauth_entry, data={**self._reauth_entry.data, **user_input}
+                    self._reauth_entry,
+                    data={**self._reauth_entry.data, **user_input},
+                    options=options,
                 )
                 await self.hass.config_entries.async_reload(self._reauth_entry.entry_id)
                 return self.async_abort(reason="reauth_successful")
-            errors["base"] = "invalid_auth"
+            errors["base"] = error
 
         return self.async_show_form(
             step_id="reauth_confirm",
-            data_schema=vol.Schema({vol.Required(CONF_API_KEY): str}),
+            data_schema=vol.Schema({vol.Required(CONF_API_KEY): API_KEYS_SELECTOR}),
             errors=errors,
         )
 
@@ -91,23 +158,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return OptionsFlowHandler(config_entry)
 
-    async def _test_api_key(self, api_key: str) -> bool:
-        """Test if the API key is valid."""
-        headers = {
-            'X-CMC_PRO_API_KEY': api_key,
-            'Accepts': 'application/json',
-        }
-        params = {
-            'symbol': 'BTC',
-            'convert': 'USD'
-        }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(API_URL, headers=headers, params=params) as response:
-                    return response.status == 200
-            except Exception:
-                return False
-
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Handle options flow for CoinMarketCap."""
 
@@ -117,19 +167,35 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            user_input[CONF_API_KEY] = normalize_api_keys(user_input[CONF_API_KEY])
+            current_keys = normalize_api_keys(self._config_entry.options.get(
+                CONF_API_KEY,
+                self._config_entry.data.get(CONF_API_KEY)
+            ))
+            if not _valid_interval_bounds(user_input):
+                errors["base"] = "invalid_interval_bounds"
+            elif not user_input[CONF_API_KEY]:
+                errors["base"] = "invalid_auth"
+            # Unchanged keys were validated before; don't hit the API for every option change
+            elif user_input[CONF_API_KEY] != current_keys and (
+                error := await _test_api_keys(user_input[CONF_API_KEY])
+            ):
+                errors["base"] = error
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
                 vol.Required(
                     CONF_API_KEY,
-                    default=self._config_entry.options.get(
+                    default=normalize_api_keys(self._config_entry.options.get(
                         CONF_API_KEY, 
                         self._config_entry.data.get(CONF_API_KEY)
-                    ),
-                ): str,
+                    )),
+                ): API_KEYS_SELECTOR,
                 vol.Required(
                     CONF_SYMBOLS,
                     default=self._config_entry.options.get(
@@ -165,5 +231,47 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         self._config_entry.data.get(CONF_SHOW_SENSORS, DEFAULT_SENSORS)
                     ),
                 ): cv.multi_select({k: v["name"] for k, v in SENSOR_TYPES.items()}),
+                vol.Optional(
+                    CONF_ALIGN_TO_UPSTREAM,
+                    default=self._config_entry.options.get(
+                        CONF_ALIGN_TO_UPSTREAM,
+                        self._config_entry.data.get(CONF_ALIGN_TO_UPSTREAM, DEFAULT_ALIGN_TO_UPSTREAM)
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_PAIRS,
+                    default=self._config_entry.options.get(
+                        CONF_PAIRS,
+                        self._config_entry.data.get(CONF_PAIRS, DEFAULT_PAIRS)
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self._config_entry.options.get(
+                        CONF_ADAPTIVE_POLLING,
+                        self._config_entry.data.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_MIN_SCAN_INTERVAL,
+                    default=self._config_entry.options.get(
+                        CONF_MIN_SCAN_INTERVAL,
+                        self._config_entry.data.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+                    ),
+                ): vol.All(cv.positive_int, vol.Range(min=60)),
+                vol.Optional(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default=self._config_entry.options.get(
+                        CONF_MAX_SCAN_INTERVAL,
+                        self._config_entry.data.get(
+                            CONF_MAX_SCAN_INTERVAL,
+                            max(DEFAULT_MAX_SCAN_INTERVAL, self._config_entry.options.get(
+                                CONF_SCAN_INTERVAL,
+                                self._config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+                            ))
+                        )
+                    ),
+                ): vol.All(cv.positive_int, vol.Range(min=60)),
             }),
+            errors=errors,
         )
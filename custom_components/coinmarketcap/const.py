@@ -1,4 +1,5 @@
 """Constants for the CoinMarketCap integration."""
+from datetime import timedelta
 
 DOMAIN = "coinmarketcap"
 
@@ -8,11 +9,56 @@ CONF_SCAN_INTERVAL = "scan_interval"
 CONF_DECIMALS = "decimals"
 CONF_SHOW_SENSORS = "show_sensors"
 CONF_CURRENCY = "currency"
+CONF_ALIGN_TO_UPSTREAM = "align_to_upstream"
+CONF_PAIRS = "pairs"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
 
 DEFAULT_SCAN_INTERVAL = 300  # 5 minutes
 DEFAULT_DECIMALS = 2
 DEFAULT_CURRENCY = "USD"
 DEFAULT_SENSORS = ["price", "percent_change_24h", "credits_left_month"]
+DEFAULT_ALIGN_TO_UPSTREAM = True
+DEFAULT_PAIRS = ""
+PAIR_DECIMALS = 8
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_SCAN_INTERVAL = 60
+DEFAULT_MAX_SCAN_INTERVAL = 900
+
+# Fired once per refresh with the metrics that changed since the previous one
+EVENT_UPDATE = f"{DOMAIN}_update"
+
+# Upstream-aligned polling
+UPSTREAM_POLL_OFFSET = timedelta(seconds=15)  # Poll this long after an expected upstream update
+DUE_TOLERANCE = timedelta(seconds=5)  # Timer jitter allowed when deciding if an endpoint is due
+CADENCE_SAMPLES = 10  # Number of upstream update gaps remembered per endpoint
+CADENCE_MIN_SECONDS = 30
+MIN_UPDATE_INTERVAL = timedelta(seconds=10)
+
+# Volatility-adaptive polling of symbol quotes
+VOLATILITY_HIGH = 2.0  # % move (1h change or since last sample) that shortens the interval
+VOLATILITY_LOW = 0.5  # % move below which the interval grows back
+ADAPTIVE_SHRINK = 0.5
+ADAPTIVE_GROW = 1.5
+
+# On-demand quotes (coinmarketcap.get_quotes)
+SERVICE_GET_QUOTES = "get_quotes"
+ATTR_SYMBOLS = "symbols"
+ATTR_MAX_AGE = "max_age"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+DEFAULT_QUOTE_MAX_AGE = 300  # seconds
+QUOTE_BATCH_WINDOW = 0.5  # seconds to collect concurrent lookups into one request
+QUOTE_CACHE_TTL = timedelta(hours=1)  # Cached on-demand quotes are dropped after this; caps max_age
+
+# Invalid symbol quarantine
+QUARANTINE_RECHECK_INTERVAL = timedelta(hours=6)  # Rejected symbols are retried this often
+
+# API key pool
+KEY_INFO_REFRESH_INTERVAL = timedelta(minutes=15)  # key/info is free; refresh each key's credits
+KEY_COOLDOWN_RATE_LIMIT = timedelta(minutes=1)
+KEY_COOLDOWN_EXHAUSTED = timedelta(hours=1)  # Daily/monthly credits used up; retried afterwards
+CREDITS_EXHAUSTED_ERROR_CODES = {1009, 1010}  # CMC error_code for daily/monthly credits used up
 
 CURRENCIES = ["USD", "EUR", "GBP", "BTC", "ETH"]
 
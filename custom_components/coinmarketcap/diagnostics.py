@@ -6,6 +6,7 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, CONF_API_KEY
 
@@ -20,6 +21,24 @@ async def async_get_config_entry_diagnostics(
     diagnostics_data = {
         "entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "coordinator_data": coordinator.data,
+        "api_keys": coordinator.key_pool.as_dict(dt_util.utcnow()),
+        "quarantined_symbols": {
+            symbol: recheck.isoformat()
+            for symbol, recheck in coordinator.quarantine.items()
+        },
+        "polling": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "next_poll": coordinator.next_poll.isoformat() if coordinator.next_poll else None,
+            "align_to_upstream": coordinator.align_to_upstream,
+            "adaptive": (
+                coordinator.adaptive_interval.as_dict()
+                if coordinator.adaptive_interval else None
+            ),
+            "endpoints": {
+                category: tracker.as_dict()
+                for category, tracker in coordinator.cadence.items()
+            },
+        },
     }
 
     return diagnostics_data
@@ -0,0 +1,72 @@
+"""Delta-encoded update events for CoinMarketCap."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import SENSOR_TYPES
+from .helpers import resolve_json_path
+
+# Coordinator data groups included in update events (key_info is diagnostic only)
+EVENT_GROUPS = ("global", "fear_greed")
+
+
+def build_snapshot(
+    data: dict[str, Any], currency: str, show_sensors: list[str]
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Flatten coordinator data into {group: {key: {metric: value}}}.
+
+    Only metrics of enabled sensor types are included. Symbols are keyed by
+    ticker, pairs by 'BASE/QUOTE' with a single `ratio` metric, and global and
+    Fear & Greed values by their group name.
+    """
+    metrics: dict[str, list[tuple[str, list[str]]]] = {}
+    for sensor_type in show_sensors:
+        if sensor_type in SENSOR_TYPES:
+            info = SENSOR_TYPES[sensor_type]
+            metrics.setdefault(info["category"], []).append((sensor_type, info["json_path"]))
+
+    snapshot: dict[str, dict[str, dict[str, Any]]] = {"symbols": {}, "pairs": {}}
+    for symbol, coin in (data.get("symbols") or {}).items():
+        snapshot["symbols"][symbol] = {
+            metric: resolve_json_path(coin, path, currency)
+            for metric, path in metrics.get("symbol", [])
+        }
+    for pair, ratio in (data.get("pairs") or {}).items():
+        snapshot["pairs"][pair] = {"ratio": ratio}
+    for group in EVENT_GROUPS:
+        if data.get(group) and metrics.get(group):
+            snapshot[group] = {
+                group: {
+                    metric: resolve_json_path(data[group], path, currency)
+                    for metric, path in metrics.get(group, [])
+                }
+            }
+    return snapshot
+
+
+def diff_snapshots(
+    previous: dict[str, dict[str, dict[str, Any]]],
+    current: dict[str, dict[str, dict[str, Any]]],
+) -> dict[str, Any]:
+    """Return only the metrics of `current` that differ from `previous`.
+
+    Symbols, pairs and groups that disappeared are not reported; metrics that
+    became unavailable are reported as None. Metrics missing from `previous`
+    are always reported, so an empty `previous` yields the whole snapshot.
+    """
+    changes: dict[str, Any] = {}
+    for group, entries in current.items():
+        previous_entries = previous.get(group, {})
+        for key, values in entries.items():
+            previous_values = previous_entries.get(key, {})
+            changed = {
+                metric: value for metric, value in values.items()
+                if metric not in previous_values or previous_values[metric] != value
+            }
+            if not changed:
+                continue
+            if group in EVENT_GROUPS:
+                changes[group] = changed
+            else:
+                changes.setdefault(group, {})[key] = changed
+    return changes
@@ -0,0 +1,21 @@
+"""Helpers shared by the CoinMarketCap modules."""
+from __future__ import annotations
+
+from typing import Any
+
+
+def resolve_json_path(data: Any, json_path: list[str], currency: str) -> Any:
+    """Follow a SENSOR_TYPES json_path through a CMC payload."""
+    value = data
+    # Dynamic path replacement for currency
+    actual_path = [k.replace("{currency}", currency) for k in json_path]
+
+    for key in actual_path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        else:
+            return None
+
+        if value is None:
+            return None
+    return value
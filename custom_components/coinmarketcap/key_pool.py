@@ -0,0 +1,188 @@
+"""API key pool with load-balanced rotation for CoinMarketCap."""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
+
+from .const import (
+    KEY_COOLDOWN_EXHAUSTED,
+    KEY_COOLDOWN_RATE_LIMIT,
+    KEY_INFO_REFRESH_INTERVAL,
+    CREDITS_EXHAUSTED_ERROR_CODES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+RATE_WINDOW = timedelta(minutes=1)
+
+
+def normalize_api_keys(value: str | list[str] | None) -> list[str]:
+    """Return the configured API keys as a list.
+
+    Entries created before key pools stored a single string; keys may also be
+    given comma- or newline-separated.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace("\n", ",").split(",")
+    keys = [key.strip() for key in value if key and key.strip()]
+    return list(dict.fromkeys(keys))
+
+
+def _merge_key_info(infos: list[dict[str, Any]]) -> dict[str, Any]:
+    """Sum the numeric usage and plan fields of several key/info payloads."""
+    merged: dict[str, Any] = {}
+    for info in infos:
+        for field, value in info.items():
+            if isinstance(value, dict):
+                merged[field] = _merge_key_info([merged.get(field, {}), value])
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                current = merged.get(field)
+                merged[field] = value + current if isinstance(current, (int, float)) else value
+            else:
+                merged.setdefault(field, value)
+    return merged
+
+
+class ApiKeyState:
+    """Rotation state of a single API key."""
+
+    def __init__(self, index: int, key: str) -> None:
+        """Initialize the key state."""
+        self.index = index
+        self.key = key
+        self.info: dict[str, Any] | None = None
+        self.info_updated: datetime | None = None
+        self.credits_left: float | None = None
+        self.rate_limit_minute: int | None = None
+        self.invalid = False
+        self.unavailable_until: datetime | None = None
+        self.last_used: datetime | None = None
+        self._recent: deque[datetime] = deque()
+
+    def requests_last_minute(self, now: datetime) -> int:
+        """Return how many requests this key made within the rate limit window."""
+        while self._recent and now - self._recent[0] >= RATE_WINDOW:
+            self._recent.popleft()
+        return len(self._recent)
+
+    def is_available(self, now: datetime) -> bool:
+        """Return True if the key may be used for a request right now."""
+        if self.invalid:
+            return False
+        if self.unavailable_until and now < self.unavailable_until:
+            return False
+        if self.credits_left is not None and self.credits_left <= 0:
+            return False
+        if self.rate_limit_minute and self.requests_last_minute(now) >= self.rate_limit_minute:
+            return False
+        return True
+
+    def record_use(self, now: datetime, credits: int) -> None:
+        """Account for a request made with this key."""
+        self.last_used = now
+        self._recent.append(now)
+        if self.credits_left is not None:
+            self.credits_left -= credits
+
+    def info_stale(self, now: datetime) -> bool:
+        """Return True if key/info should be fetched again."""
+        return self.info_updated is None or now - self.info_updated >= KEY_INFO_REFRESH_INTERVAL
+
+    def as_dict(self, now: datetime) -> dict[str, Any]:
+        """Return the key state for diagnostics, without the key itself."""
+        return {
+            "index": self.index,
+            "available": self.is_available(now),
+            "invalid": self.invalid,
+            "unavailable_until": self.unavailable_until.isoformat() if self.unavailable_until else None,
+            "credits_left": self.credits_left,
+            "rate_limit_minute": self.rate_limit_minute,
+            "requests_last_minute": self.requests_last_minute(now),
+        }
+
+
+class ApiKeyPool:
+    """Spread requests across several API keys by remaining credits and rate limit."""
+
+    def __init__(self, keys: list[str]) -> None:
+        """Initialize the pool."""
+        self.keys = [ApiKeyState(index, key) for index, key in enumerate(keys)]
+
+    def __len__(self) -> int:
+        """Return the number of keys in the pool."""
+        return len(self.keys)
+
+    @property
+    def all_invalid(self) -> bool:
+        """Return True if no key in the pool is accepted by CoinMarketCap."""
+        return all(state.invalid for state in self.keys)
+
+    def select(self, now: datetime, exclude: set[int] | None = None) -> ApiKeyState | None:
+        """Return the available key with the most headroom, if any.
+
+        Keys are ranked by remaining credits (unknown counts as unlimited until
+        key/info has been fetched), then by requests made in the current
+        minute, then by how long ago they were last used.
+        """
+        candidates = [
+            state for state in self.keys
+            if state.index not in (exclude or set()) and state.is_available(now)
+        ]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda state: (
+                -(state.credits_left if state.credits_left is not None else float("inf")),
+                state.requests_last_minute(now),
+                state.last_used or datetime.min.replace(tzinfo=now.tzinfo),
+            ),
+        )
+
+    def mark_invalid(self, state: ApiKeyState) -> None:
+        """Take a rejected key out of rotation until the entry is reloaded."""
+        state.invalid = True
+        _LOGGER.error("API key #%s was rejected and is taken out of rotation", state.index + 1)
+
+    def mark_rate_limited(self, state: ApiKeyState, now: datetime, error_code: int | None) -> None:
+        """Pause a key that hit a rate limit or ran out of credits.
+
+        Only used-up daily or monthly credits pause the key for long; minute
+        and IP rate limits or unknown errors are retried shortly after.
+        """
+        if error_code in CREDITS_EXHAUSTED_ERROR_CODES:
+            state.unavailable_until = now + KEY_COOLDOWN_EXHAUSTED
+        else:
+            state.unavailable_until = now + KEY_COOLDOWN_RATE_LIMIT
+        _LOGGER.warning(
+            "API key #%s is rate limited or out of credits (error %s), paused until %s",
+            state.index + 1, error_code, state.unavailable_until,
+        )
+
+    def update_info(self, state: ApiKeyState, info: dict[str, Any], now: datetime) -> None:
+        """Refresh a key's remaining credits and rate limit from key/info."""
+        state.info = info
+        state.info_updated = now
+        usage = info.get("usage", {})
+        remaining = [
+            usage.get(period, {}).get("credits_left")
+            for period in ("current_day", "current_month")
+        ]
+        remaining = [value for value in remaining if isinstance(value, (int, float))]
+        state.credits_left = min(remaining) if remaining else None
+        state.rate_limit_minute = info.get("plan", {}).get("rate_limit_minute")
+
+    def aggregate_info(self) -> dict[str, Any] | None:
+        """Return the combined key/info of all valid keys."""
+        infos = [state.info for state in self.keys if state.info and not state.invalid]
+        if not infos:
+            return None
+        return _merge_key_info(infos)
+
+    def as_dict(self, now: datetime) -> list[dict[str, Any]]:
+        """Return the pool state for diagnostics."""
+        return [state.as_dict(now) for state in self.keys]
@@ -0,0 +1,65 @@
+"""Cross-rate (pair ratio) computation for CoinMarketCap quotes."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_pairs(pairs: str) -> list[tuple[str, str]]:
+    """Parse a pair list such as 'ETH/BTC,SOL/ETH' into (base, quote) tuples."""
+    parsed = []
+    for item in pairs.replace(" ", "").upper().split(","):
+        if not item:
+            continue
+        base, sep, quote = item.partition("/")
+        if not sep or not base or not quote or "/" in quote or base == quote:
+            _LOGGER.warning("Ignoring invalid pair '%s' (expected BASE/QUOTE)", item)
+            continue
+        if (base, quote) not in parsed:
+            parsed.append((base, quote))
+    return parsed
+
+
+def pair_name(base: str, quote: str) -> str:
+    """Return the key used for a pair in the coordinator data."""
+    return f"{base}/{quote}"
+
+
+class PairRatioMatrix:
+    """Compute price ratios for a set of pairs from a single quotes payload.
+
+    All prices are read once into a price vector per update; only pairs whose
+    base or quote price changed since the previous update are recomputed.
+    """
+
+    def __init__(self, pairs: list[tuple[str, str]]) -> None:
+        """Initialize the matrix."""
+        self.pairs = pairs
+        self._inputs: dict[str, tuple[float, float]] = {}
+        self._ratios: dict[str, float | None] = {}
+
+    def update(self, symbols_data: dict[str, Any], currency: str) -> dict[str, float | None]:
+        """Return the ratio of every pair, recomputing the ones with changed inputs."""
+        prices: dict[str, float | None] = {}
+        for symbol in {leg for pair in self.pairs for leg in pair}:
+            coin = symbols_data.get(symbol)
+            price = None
+            if isinstance(coin, dict):
+                price = coin.get("quote", {}).get(currency, {}).get("price")
+            prices[symbol] = price if isinstance(price, (int, float)) else None
+
+        for base, quote in self.pairs:
+            name = pair_name(base, quote)
+            base_price, quote_price = prices[base], prices[quote]
+            if base_price is None or not quote_price:
+                self._inputs.pop(name, None)
+                self._ratios[name] = None
+                continue
+            if self._inputs.get(name) == (base_price, quote_price):
+                continue
+            self._inputs[name] = (base_price, quote_price)
+            self._ratios[name] = base_price / quote_price
+
+        return dict(self._ratios)
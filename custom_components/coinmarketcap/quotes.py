@@ -0,0 +1,63 @@
+"""On-demand quote lookups for CoinMarketCap."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import QUOTE_BATCH_WINDOW
+
+
+def format_quote(coin: dict[str, Any], currency: str) -> dict[str, Any]:
+    """Flatten a CMC coin record into a service response entry."""
+    quote = coin.get("quote", {}).get(currency, {})
+    return {
+        "id": coin.get("id"),
+        "name": coin.get("name"),
+        "symbol": coin.get("symbol"),
+        "cmc_rank": coin.get("cmc_rank"),
+        "circulating_supply": coin.get("circulating_supply"),
+        "total_supply": coin.get("total_supply"),
+        "max_supply": coin.get("max_supply"),
+        "currency": currency,
+        **quote,
+    }
+
+
+class QuoteBatcher:
+    """Collect concurrent quote lookups and serve them with a single upstream request.
+
+    The first lookup opens a short window; every symbol requested while the
+    window is open is fetched together once it closes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fetch: Callable[[set[str]], Awaitable[dict[str, Any]]],
+    ) -> None:
+        """Initialize the batcher."""
+        self.hass = hass
+        self._fetch = fetch
+        self._pending: set[str] = set()
+        self._future: asyncio.Future[dict[str, Any]] | None = None
+
+    async def async_get(self, symbols: set[str]) -> dict[str, Any]:
+        """Return upstream data for the given symbols, batched with concurrent lookups."""
+        if self._future is None:
+            self._future = self.hass.loop.create_future()
+            self.hass.async_create_task(self._async_flush(self._future))
+        self._pending |= symbols
+        result = await asyncio.shield(self._future)
+        return {symbol: result[symbol] for symbol in symbols if symbol in result}
+
+    async def _async_flush(self, future: asyncio.Future[dict[str, Any]]) -> None:
+        """Fetch all symbols requested during the batch window."""
+        await asyncio.sleep(QUOTE_BATCH_WINDOW)
+        symbols, self._pending, self._future = self._pending, set(), None
+        try:
+            future.set_result(await self._fetch(symbols))
+        except Exception as err:  # pylint: disable=broad-except
+            future.set_exception(err)
@@ -0,0 +1,218 @@
+"""Upstream-aligned polling schedule for CoinMarketCap."""
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_GROW,
+    ADAPTIVE_SHRINK,
+    CADENCE_MIN_SECONDS,
+    CADENCE_SAMPLES,
+    DUE_TOLERANCE,
+    UPSTREAM_POLL_OFFSET,
+    VOLATILITY_HIGH,
+    VOLATILITY_LOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys that carry the upstream update time of a Fear & Greed record
+FEAR_GREED_TIMESTAMP_KEYS = ("update_time", "last_updated", "timestamp")
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    """Parse an ISO 8601 string or a unix timestamp into an aware datetime."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+        return dt_util.utc_from_timestamp(float(value))
+    if isinstance(value, str):
+        return dt_util.parse_datetime(value)
+    return None
+
+
+def upstream_timestamp(category: str, data: Any) -> datetime | None:
+    """Return the most recent upstream update time contained in an endpoint payload."""
+    if not data:
+        return None
+
+    if category == "symbol" and isinstance(data, dict):
+        latest = None
+        for coin in data.values():
+            if not isinstance(coin, dict):
+                continue
+            stamps = [coin.get("last_updated")]
+            stamps.extend(
+                quote.get("last_updated")
+                for quote in coin.get("quote", {}).values()
+                if isinstance(quote, dict)
+            )
+            for stamp in stamps:
+                parsed = _parse_timestamp(stamp)
+                if parsed and (latest is None or parsed > latest):
+                    latest = parsed
+        return latest
+
+    if category == "global" and isinstance(data, dict):
+        return _parse_timestamp(data.get("last_updated"))
+
+    if category == "fear_greed" and isinstance(data, dict):
+        for key in FEAR_GREED_TIMESTAMP_KEYS:
+            parsed = _parse_timestamp(data.get(key))
+            if parsed:
+                return parsed
+
+    return None
+
+
+class UpstreamCadence:
+    """Track how often an endpoint's data advances upstream and when to poll it next."""
+
+    def __init__(self, category: str) -> None:
+        """Initialize the tracker."""
+        self.category = category
+        self.last_upstream: datetime | None = None
+        self.next_due: datetime | None = None
+        self.advanced = False
+        self._first_seen: datetime | None = None
+        self._deltas: deque[float] = deque(maxlen=CADENCE_SAMPLES)
+
+    @property
+    def cadence(self) -> timedelta | None:
+        """Return the learned upstream update period, if known.
+
+        The shortest recorded gap is used. Only gaps shorter than the poll
+        spacing that produced them are recorded, so our own polling rhythm is
+        never mistaken for the upstream one.
+        """
+        if not self._deltas:
+            return None
+        return timedelta(seconds=max(min(self._deltas), CADENCE_MIN_SECONDS))
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the endpoint should be fetched at this tick."""
+        return self.next_due is None or now >= self.next_due - DUE_TOLERANCE
+
+    def observe(self, timestamp: datetime | None, now: datetime) -> None:
+        """Record the upstream timestamp seen in a payload fetched at `now`."""
+        self.advanced = False
+        if timestamp is None:
+            return
+        if self.last_upstream is not None:
+            if timestamp <= self.last_upstream:
+                return
+            # A gap as long as the polls that saw both ends may span several updates
+            gap = timestamp - self.last_upstream
+            if self._first_seen is not None and gap < now - self._first_seen:
+                self._deltas.append(gap.total_seconds())
+        self.last_upstream = timestamp
+        self._first_seen = now
+        self.advanced = True
+
+    def schedule(self, now: datetime, interval: timedelta, align: bool = True) -> None:
+        """Plan the next fetch no earlier than `interval` from now.
+
+        With a known cadence the poll is moved to just after the expected
+        upstream update, but never more than `UPSTREAM_POLL_OFFSET` past the
+        plain interval; a slot further out falls back to the plain interval.
+        The same applies if the data failed to advance when expected.
+        """
+        earliest = now + interval
+        cadence = self.cadence
+        if not align or cadence is None or self.last_upstream is None or not self.advanced:
+            self.next_due = earliest
+            return
+
+        # Allow for jitter so an update due right at `earliest` is not pushed a whole period
+        steps = max(1, math.ceil(
+            (earliest - UPSTREAM_POLL_OFFSET - DUE_TOLERANCE - self.last_upstream) / cadence
+        ))
+        aligned = max(self.last_upstream + steps * cadence + UPSTREAM_POLL_OFFSET, earliest)
+        self.next_due = aligned if aligned <= earliest + UPSTREAM_POLL_OFFSET else earliest
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracker state for diagnostics."""
+        cadence = self.cadence
+        return {
+            "last_upstream": self.last_upstream.isoformat() if self.last_upstream else None,
+            "cadence_seconds": cadence.total_seconds() if cadence else None,
+            "next_due": self.next_due.isoformat() if self.next_due else None,
+        }
+
+
+class AdaptiveInterval:
+    """Shorten the quote poll interval during sharp price moves, lengthen it when calm."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        """Initialize the interval within its bounds."""
+        if maximum < minimum:
+            _LOGGER.warning(
+                "Adaptive polling maximum interval %ss is below the minimum %ss; using %ss for both",
+                maximum, minimum, minimum,
+            )
+            maximum = minimum
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = float(min(max(initial, self.minimum), self.maximum))
+        if self.interval != initial:
+            _LOGGER.warning(
+                "Update interval %ss is outside the adaptive polling bounds %ss-%ss; starting at %ss",
+                initial, self.minimum, self.maximum, int(self.interval),
+            )
+        self.reason = "initial interval"
+        self.volatile = False
+        self._prices: dict[str, float] = {}
+
+    def update(self, symbols_data: dict[str, Any] | None, currency: str) -> timedelta:
+        """Adjust the interval to the largest recent price move and return it.
+
+        A move is the absolute `percent_change_1h` or the change in `price`
+        since the previous sample, whichever is larger.
+        """
+        if not symbols_data:
+            return timedelta(seconds=self.interval)
+
+        self.volatile = False
+        largest, source = 0.0, None
+        prices = {}
+        for symbol, coin in symbols_data.items():
+            quote = coin.get("quote", {}).get(currency, {}) if isinstance(coin, dict) else {}
+            change_1h = quote.get("percent_change_1h")
+            if isinstance(change_1h, (int, float)) and abs(change_1h) > largest:
+                largest, source = abs(change_1h), f"{symbol} 1h change {change_1h:+.2f}%"
+            price = quote.get("price")
+            if not isinstance(price, (int, float)) or price <= 0:
+                continue
+            prices[symbol] = price
+            previous = self._prices.get(symbol)
+            if previous:
+                move = (price / previous - 1) * 100
+                if abs(move) > largest:
+                    largest, source = abs(move), f"{symbol} moved {move:+.2f}% since last sample"
+        self._prices = prices
+
+        if largest >= VOLATILITY_HIGH:
+            self.interval = max(self.minimum, self.interval * ADAPTIVE_SHRINK)
+            self.reason = f"volatile: {source}"
+            self.volatile = True
+        elif largest <= VOLATILITY_LOW:
+            self.interval = min(self.maximum, self.interval * ADAPTIVE_GROW)
+            self.reason = f"calm: largest move {largest:.2f}%"
+        else:
+            self.reason = f"steady: {source}"
+        return timedelta(seconds=self.interval)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the adaptive state for diagnostics."""
+        return {
+            "interval": self.interval,
+            "reason": self.reason,
+            "min_interval": self.minimum,
+            "max_interval": self.maximum,
+        }
@@ -13,8 +13,10 @@ from homeassistant.const import EntityCategory
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SENSOR_TYPES, CONF_SHOW_SENSORS, DEFAULT_SENSORS, CURRENCIES
+from .const import DOMAIN, SENSOR_TYPES, CONF_SHOW_SENSORS, DEFAULT_SENSORS, CURRENCIES, PAIR_DECIMALS
 from . import CoinMarketCapDataUpdateCoordinator
+from .helpers import resolve_json_path
+from .pairs import pair_name
 
 async def async_setup_entry(
     hass: HomeAssistant, 
@@ -40,10 +42,32 @@ async def async_setup_entry(
     for sensor_type in enabled_sensors:
         if sensor_type in SENSOR_TYPES and SENSOR_TYPES[sensor_type]["category"] in ["global", "fear_greed", "key_info"]:
             entities.append(CoinMarketCapSensor(coordinator, None, sensor_type))
+
+    # Add pair ratio sensors (computed locally from the fetched quotes)
+    for base, quote in coordinator.pairs.pairs:
+        entities.append(CoinMarketCapPairSensor(coordinator, base, quote))
         
     async_add_entities(entities)
 
-class CoinMarketCapSensor(CoordinatorEntity, SensorEntity):
+class CoinMarketCapEntity(CoordinatorEntity):
+    """Base class for entities of the CoinMarketCap service device."""
+
+    def __init__(self, coordinator: CoinMarketCapDataUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._entry_id = coordinator.config_entry.entry_id
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this entity."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._entry_id)},
+            name="CoinMarketCap",
+            manufacturer="CoinMarketCap",
+            entry_type="service",
+        )
+
+class CoinMarketCapSensor(CoinMarketCapEntity, SensorEntity):
     """Representation of a CoinMarketCap sensor."""
 
     def __init__(
@@ -64,8 +88,6 @@ class CoinMarketCapSensor(CoordinatorEntity, SensorEntity):
         else:
             self._attr_name = f"CMC {self._sensor_info['name']}"
             self._attr_unique_id = f"{DOMAIN}_{sensor_type}"
-            
-        self._entry_id = coordinator.config_entry.entry_id
         
         # Set icon if defined
         if "icon" in self._sensor_info:
@@ -84,16 +106,6 @@ class CoinMarketCapSensor(CoordinatorEntity, SensorEntity):
             else:
                 self._attr_entity_category = self._sensor_info["entity_category"]
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device information about this entity."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._entry_id)},
-            name="CoinMarketCap",
-            manufacturer="CoinMarketCap",
-            entry_type="service",
-        )
-
     @property
     def icon(self) -> str | None:
         """Return dynamic icon for Fear & Greed."""
@@ -124,20 +136,9 @@ class CoinMarketCapSensor(CoordinatorEntity, SensorEntity):
             data = None
 
         if data:
-            value = data
-            json_path = self._sensor_info["json_path"]
-            
-            # Dynamic path replacement for currency
-            actual_path = [k.replace("{currency}", self.coordinator.currency) for k in json_path]
-            
-            for key in actual_path:
-                if isinstance(value, dict):
-                    value = value.get(key)
-                else:
-                    return None
-                    
-                if value is None:
-                    return None
+            value = resolve_json_path(data, self._sensor_info["json_path"], self.coordinator.currency)
+            if value is None:
+                return None
             
             # Formatting
             if isinstance(value, (int, float)):
@@ -189,3 +190,40 @@ class CoinMarketCapSensor(CoordinatorEntity, SensorEntity):
                 "rate_limit_minute": data.get('plan', {}).get('rate_limit_minute')
             }
         return None
+
+class CoinMarketCapPairSensor(CoinMarketCapEntity, SensorEntity):
+    """Representation of a cross rate between two tracked symbols."""
+
+    _attr_icon = "mdi:swap-horizontal"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, 
+        coordinator: CoinMarketCapDataUpdateCoordinator, 
+        base: str, 
+        quote: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._base = base
+        self._quote = quote
+        self._pair = pair_name(base, quote)
+        self._attr_name = f"{base}/{quote} Ratio"
+        self._attr_unique_id = f"{DOMAIN}_{base}_{quote}_pair"
+        self._attr_native_unit_of_measurement = quote
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        value = self.coordinator.data.get('pairs', {}).get(self._pair)
+        if value is None:
+            return None
+        return round(value, PAIR_DECIMALS)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        return {
+            "base": self._base,
+            "quote": self._quote,
+        }
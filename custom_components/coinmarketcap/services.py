@@ -0,0 +1,87 @@
+"""Services for the CoinMarketCap integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    SERVICE_GET_QUOTES,
+    ATTR_SYMBOLS,
+    ATTR_MAX_AGE,
+    ATTR_CONFIG_ENTRY_ID,
+    DEFAULT_QUOTE_MAX_AGE,
+    QUOTE_CACHE_TTL,
+)
+from .quotes import format_quote
+
+
+def _symbol_list(value) -> list[str]:
+    """Accept a comma-separated string or a list of symbols."""
+    if isinstance(value, str):
+        value = value.split(",")
+    symbols = [str(symbol).strip().upper() for symbol in cv.ensure_list(value)]
+    symbols = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+    if not symbols:
+        raise vol.Invalid("At least one symbol is required")
+    return symbols
+
+
+GET_QUOTES_SCHEMA = vol.Schema({
+    vol.Required(ATTR_SYMBOLS): _symbol_list,
+    vol.Optional(ATTR_MAX_AGE, default=DEFAULT_QUOTE_MAX_AGE): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=int(QUOTE_CACHE_TTL.total_seconds()))
+    ),
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the CoinMarketCap services."""
+
+    async def async_get_quotes(call: ServiceCall) -> ServiceResponse:
+        """Return quotes for arbitrary symbols, served from cache where possible."""
+        coordinators = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id:
+            coordinator = coordinators.get(entry_id)
+        else:
+            coordinator = next(iter(coordinators.values()), None)
+        if coordinator is None:
+            raise HomeAssistantError("No loaded CoinMarketCap entry found")
+
+        symbols = call.data[ATTR_SYMBOLS]
+        try:
+            quotes = await coordinator.async_get_quotes(
+                symbols, timedelta(seconds=call.data[ATTR_MAX_AGE])
+            )
+        except ConfigEntryAuthFailed as err:
+            raise HomeAssistantError(str(err)) from err
+
+        return {
+            "quotes": {
+                symbol: format_quote(quotes[symbol], coordinator.currency)
+                for symbol in symbols if symbol in quotes
+            },
+            "missing": [symbol for symbol in symbols if symbol not in quotes],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_QUOTES,
+        async_get_quotes,
+        schema=GET_QUOTES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
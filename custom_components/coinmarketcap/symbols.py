@@ -0,0 +1,70 @@
+"""Isolation of invalid symbols in CoinMarketCap quote requests."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# e.g. 'Invalid value for "symbol": "FOO,BAR"'
+INVALID_SYMBOL_PATTERN = re.compile(r'"symbol"\s*:\s*"([^"]+)"', re.IGNORECASE)
+
+
+class InvalidSymbolsError(HomeAssistantError):
+    """CoinMarketCap rejected a quotes request because of unknown symbols."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error with the symbols named in the API message."""
+        super().__init__(message)
+        match = INVALID_SYMBOL_PATTERN.search(message)
+        self.symbols = (
+            {symbol.strip().upper() for symbol in match.group(1).split(",") if symbol.strip()}
+            if match else set()
+        )
+
+
+async def async_fetch_isolating(
+    fetch: Callable[[list[str]], Awaitable[dict[str, Any] | None]],
+    symbols: list[str],
+) -> tuple[dict[str, Any] | None, set[str]]:
+    """Fetch quotes, isolating the symbols CoinMarketCap rejects.
+
+    Symbols named in the error message are dropped and the rest retried
+    directly, which usually costs a single extra request. Otherwise the batch
+    is bisected until each rejected symbol is found on its own.
+    Returns the merged data (None if no request succeeded) and the invalid
+    symbols.
+    """
+    try:
+        return await fetch(symbols), set()
+    except InvalidSymbolsError as err:
+        named = err.symbols & set(symbols)
+        _LOGGER.debug("Quotes request rejected for %s: %s", symbols, err)
+
+    if named:
+        rest = [symbol for symbol in symbols if symbol not in named]
+        if not rest:
+            return {}, named
+        data, invalid = await async_fetch_isolating(fetch, rest)
+        return data, invalid | named
+
+    if len(symbols) == 1:
+        return {}, set(symbols)
+
+    middle = len(symbols) // 2
+    halves = await asyncio.gather(
+        async_fetch_isolating(fetch, symbols[:middle]),
+        async_fetch_isolating(fetch, symbols[middle:]),
+    )
+    data: dict[str, Any] | None = None
+    invalid: set[str] = set()
+    for half_data, half_invalid in halves:
+        if half_data is not None:
+            data = {**(data or {}), **half_data}
+        invalid |= half_invalid
+    return data, invalid
@@ -0,0 +1,87 @@
+"""Tests for the upstream-aligned polling schedule."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.coinmarketcap.const import DUE_TOLERANCE, UPSTREAM_POLL_OFFSET  # noqa: E402
+from custom_components.coinmarketcap.scheduler import AdaptiveInterval, UpstreamCadence  # noqa: E402
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _simulate(period: int, interval: int, jitter: float, polls: int = 200, seed: int = 1):
+    """Poll a periodic upstream with jittered update times; return the tracker and poll gaps."""
+    rng = random.Random(seed)
+    updates = [
+        START + timedelta(seconds=step * period + rng.uniform(-jitter, jitter))
+        for step in range(polls * interval // period + 10)
+    ]
+    tracker = UpstreamCadence("global")
+    now = START + timedelta(seconds=rng.uniform(0, period))
+    gaps = []
+    for _ in range(polls):
+        latest = max((update for update in updates if update <= now), default=None)
+        tracker.observe(latest, now)
+        tracker.schedule(now, timedelta(seconds=interval))
+        # The coordinator tick itself fires slightly late
+        following = tracker.next_due + timedelta(seconds=rng.uniform(0, 2))
+        gaps.append((following - now).total_seconds())
+        now = following
+    return tracker, gaps
+
+
+@pytest.mark.parametrize(
+    ("period", "interval"),
+    [(60, 300), (300, 300), (120, 300), (300, 60), (900, 300)],
+)
+def test_poll_spacing_stays_near_interval(period: int, interval: int) -> None:
+    """Aligning to upstream never stretches the poll spacing by more than the offset."""
+    _, gaps = _simulate(period, interval, jitter=3)
+    limit = interval + (UPSTREAM_POLL_OFFSET + DUE_TOLERANCE).total_seconds()
+    assert min(gaps) >= interval
+    assert max(gaps) <= limit
+
+
+@pytest.mark.parametrize(
+    ("period", "interval"),
+    [(60, 300), (300, 300), (120, 300), (300, 60), (900, 300)],
+)
+def test_cadence_does_not_learn_poll_spacing(period: int, interval: int) -> None:
+    """The learned cadence is the upstream period or a multiple shorter than the poll spacing."""
+    tracker, _ = _simulate(period, interval, jitter=3)
+    cadence = tracker.cadence
+    if cadence is None:
+        return
+    seconds = cadence.total_seconds()
+    multiple = round(seconds / period)
+    assert multiple >= 1
+    assert abs(seconds - multiple * period) <= 6
+    assert seconds < max(period, interval) + 6
+
+
+def test_cadence_learned_when_polling_faster_than_upstream() -> None:
+    """Polling faster than upstream learns the true period."""
+    tracker, _ = _simulate(300, 60, jitter=3)
+    assert tracker.cadence is not None
+    assert abs(tracker.cadence.total_seconds() - 300) <= 6
+
+
+def _quotes(change_1h: float) -> dict:
+    """Return a single-coin quotes payload with the given 1h change."""
+    return {"BTC": {"quote": {"USD": {"price": 100.0, "percent_change_1h": change_1h}}}}
+
+
+def test_adaptive_interval_flags_volatile_moves() -> None:
+    """Sharp moves shorten the interval and flag it as volatile until prices calm down."""
+    adaptive = AdaptiveInterval(300, 60, 900)
+    adaptive.update(_quotes(5.0), "USD")
+    assert adaptive.volatile
+    assert adaptive.interval == 150
+    adaptive.update(_quotes(0.1), "USD")
+    assert not adaptive.volatile
+    assert adaptive.interval == 225